@@ -0,0 +1,7 @@
+-- Lets the officeholder lookups (PlayerObject.get_officeholder) take the
+-- newest row for an office straight from an index instead of sorting the
+-- table. Run once against the database, e.g.
+--   psql -d <database> -f Migrations/officeholders_office_id_desc.sql
+-- CONCURRENTLY avoids blocking writes to officeholders while it builds.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS officeholders_office_id_desc
+    ON officeholders (office, id DESC);
@@ -4,6 +4,7 @@ import asyncpg
 import coolname
 
 import json
+import math
 import random
 
 from Utilities import Checks, Vars
@@ -60,6 +61,9 @@ class Acolyte:
     await add_duplicate()
         Increases the acolyte's dupes value by 1
     """
+    __slots__ = ('is_empty', 'gen_dict', 'acolyte_id', 'owner_id', 
+        'acolyte_name', 'xp', 'level', 'dupes')
+
     def __init__(self, record : asyncpg.Record = None):
         """
         Parameters
@@ -110,13 +114,8 @@ class Acolyte:
 
     def get_level(self) -> int:
         """Returns the acolyte's level."""
-        def f(x):
-            return int(300 * (x**2))
-
-        level = 0
-        while (self.xp >= f(level)):
-            level += 1
-        level -= 1
+        # Inverse of the level curve xp = 300 * level**2
+        level = math.isqrt(self.xp // 300)
 
         if level > 100:
             level = 100
@@ -204,6 +203,10 @@ class Acolyte:
         await conn.execute(psql, self.acolyte_id)
 
 
+# Shared empty acolyte for unequipped slots. Do not modify this.
+EMPTY_ACOLYTE = Acolyte()
+
+
 async def get_acolyte_by_id(conn : asyncpg.Connection, 
         acolyte_id : int) -> Acolyte:
     """Return an acolyte object of the acolyte with the given ID."""
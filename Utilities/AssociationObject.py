@@ -46,6 +46,9 @@ class Association:
     lvl_req = int
         The minimum level for players to join via the join command
     """
+    __slots__ = ('is_empty', 'id', 'name', 'type', 'xp', 'leader', 'desc', 
+        'icon', 'join_status', 'base', 'base_set', 'lvl_req')
+
     def __init__(self, record : asyncpg.Record = None): 
         """
         Parameters
@@ -116,14 +119,8 @@ class Association:
         Using ctx.defer() in any command that invokes this method may be 
         a good idea.
         """
-        psql = """
-                SELECT user_id
-                FROM players
-                WHERE assc = $1;
-                """
-        members = await conn.fetch(psql, self.id)
-        from Utilities.PlayerObject import get_player_by_id as gpbi
-        return [await gpbi(conn, id['user_id']) for id in members]
+        from Utilities.PlayerObject import get_players_by_assc
+        return await get_players_by_assc(conn, self.id)
 
     async def increase_xp(self, conn : asyncpg.Connection, xp : int):
         """Increase the association's xp by the given amount."""
@@ -310,7 +307,7 @@ class Association:
         if self.type != "Brotherhood":
             raise Checks.NotInSpecifiedAssociation("Brotherhood")
 
-        from Utilities.PlayerObject import get_player_by_id # evil emoji
+        from Utilities.PlayerObject import get_players_by_id # evil emoji
 
         psql = """
                 SELECT champ1, champ2, champ3
@@ -318,15 +315,11 @@ class Association:
                 WHERE assc_id = $1;
                 """
         champs = await conn.fetchrow(psql, self.id)
-        champ_list = [None, None, None]
-        if champs['champ1'] is not None:
-            champ_list[0] = await get_player_by_id(conn, champs['champ1'])
-        if champs['champ2'] is not None:
-            champ_list[1] = await get_player_by_id(conn, champs['champ2'])
-        if champs['champ3'] is not None:
-            champ_list[2] = await get_player_by_id(conn, champs['champ3'])      
+        players = await get_players_by_id(
+            conn, [champ for champ in champs.values() if champ is not None])
+        players = {player.disc_id : player for player in players}
 
-        return champ_list
+        return [players.get(champ) for champ in champs.values()]
 
     async def set_champion(self, conn : asyncpg.Connection, player_id : int, 
             slot : int):
@@ -412,6 +405,10 @@ class Association:
         await conn.execute(psql, area, self.id)
 
 
+# Shared empty association for players in none. Do not modify this.
+EMPTY_ASSC = Association()
+
+
 async def get_assc_by_id(conn : asyncpg.Connection, 
         assc_id : int) -> Association:
     """Return an association object of the association with the given ID."""
@@ -150,50 +150,53 @@ class NotAdmin(Exception):
 
 # --- NOW FOR THE ACTUAL CHECKS :) ---
 
-async def not_player(ctx):
-    async with ctx.bot.db.acquire() as conn:
-        psql = """
-                SELECT user_id
-                FROM players
-                WHERE user_id = $1;
-                """
-        result = await conn.fetchval(psql, ctx.author.id)
-        
+# Discord IDs found to have a character. Characters are never deleted, so
+# these players do not need to be looked up again.
+_known_players = set()
+
+# Auxiliary function - don't use in commands
+async def _has_char(ctx) -> bool:
+    if ctx.author.id in _known_players:
+        return True
+
+    psql = """
+            SELECT user_id
+            FROM players
+            WHERE user_id = $1;
+            """
+    result = await ctx.bot.db.fetchval(psql, ctx.author.id)
+
     if result is None:
+        return False
+    _known_players.add(ctx.author.id)
+    return True
+
+async def not_player(ctx):
+    if not await _has_char(ctx):
         return True
     raise HasChar(ctx.author, 
         message='Player has a character and failed not_player check.')
 
 async def is_player(ctx):
-    async with ctx.bot.db.acquire() as conn:
-        psql = """
-                SELECT user_id
-                FROM players
-                WHERE user_id = $1;
-                """
-        result = await conn.fetchval(psql, ctx.author.id)
-
-    if result is None:
+    if not await _has_char(ctx):
         raise PlayerHasNoChar
     return True
 
 async def is_not_travelling(ctx):
-    async with ctx.bot.db.acquire() as conn:
-        from Utilities.PlayerObject import get_player_by_id
-        player = await get_player_by_id(conn, ctx.author.id)
-        
+    from Utilities.PlayerObject import get_player_by_id
+    player = await get_player_by_id(ctx.bot.db, ctx.author.id)
+
     if player.adventure is None:
         return True
     raise CurrentlyTraveling(player.adventure, player.destination)
 
 async def is_travelling(ctx):
-    async with ctx.bot.db.acquire() as conn:
-        psql = """
-                SELECT adventure
-                FROM players
-                WHERE user_id = $1;
-                """
-        result = await conn.fetchval(psql, ctx.author.id)
+    psql = """
+            SELECT adventure
+            FROM players
+            WHERE user_id = $1;
+            """
+    result = await ctx.bot.db.fetchval(psql, ctx.author.id)
 
     if result is None:
         raise NotCurrentlyTraveling
@@ -201,15 +204,14 @@ async def is_travelling(ctx):
 
 # Auxiliary function - don't use in commands
 async def _get_assc(ctx):
-    async with ctx.bot.db.acquire() as conn:
-        psql = """
-                SELECT players.assc, associations.assc_type
-                FROM players
-                LEFT JOIN associations
-                    ON players.assc = associations.assc_id
-                WHERE user_id = $1;
-                """
-        return await conn.fetchrow(psql, ctx.author.id)
+    psql = """
+            SELECT players.assc, associations.assc_type
+            FROM players
+            LEFT JOIN associations
+                ON players.assc = associations.assc_id
+            WHERE user_id = $1;
+            """
+    return await ctx.bot.db.fetchrow(psql, ctx.author.id)
 
 async def in_association(ctx):
     record = await _get_assc(ctx)
@@ -256,8 +258,7 @@ async def is_assc_leader(ctx):
             FROM players
             WHERE user_id = $1;
             """
-    async with ctx.bot.db.acquire() as conn:
-        rank = await conn.fetchval(psql, ctx.author.id)
+    rank = await ctx.bot.db.fetchval(psql, ctx.author.id)
     if rank != "Leader":
         raise IncorrectAssociationRank("Leader")
     return True
@@ -268,8 +269,7 @@ async def is_assc_officer(ctx):
             FROM players
             WHERE user_id = $1;
             """
-    async with ctx.bot.db.acquire() as conn:
-        rank = await conn.fetchval(psql, ctx.author.id)
+    rank = await ctx.bot.db.fetchval(psql, ctx.author.id)
     if rank not in ("Leader", "Officer"):
         raise IncorrectAssociationRank("Officer")
     return True
@@ -281,27 +281,15 @@ def is_admin(ctx):
         raise NotAdmin
 
 async def is_mayor(ctx):
-    psql = """
-            SELECT officeholder
-            FROM officeholders
-            WHERE office = 'Mayor'
-            ORDER BY id DESC
-            LIMIT 1;
-            """
-    async with ctx.bot.db.acquire() as conn:
-        if ctx.author.id == await conn.fetchval(psql):
-            return True
-        raise NotMayor
+    from Utilities.PlayerObject import get_mayor
+    record = await get_mayor(ctx.bot.db)
+    if record is not None and ctx.author.id == record['officeholder']:
+        return True
+    raise NotMayor
 
 async def is_comptroller(ctx):
-    psql = """
-            SELECT officeholder
-            FROM officeholders
-            WHERE office = 'Comptroller'
-            ORDER BY id DESC
-            LIMIT 1;
-            """
-    async with ctx.bot.db.acquire() as conn:
-        if ctx.author.id == await conn.fetchval(psql):
-            return True
-        raise NotComptroller
\ No newline at end of file
+    from Utilities.PlayerObject import get_comptroller
+    record = await get_comptroller(ctx.bot.db)
+    if record is not None and ctx.author.id == record['officeholder']:
+        return True
+    raise NotComptroller
\ No newline at end of file
@@ -3,9 +3,10 @@ import discord
 import random
 
 from Utilities import PlayerObject, Vars
-from Utilities.AcolyteObject import Acolyte
-from Utilities.AssociationObject import Association
-from Utilities.ItemObject import Accessory, Weapon, Armor
+from Utilities.AcolyteObject import Acolyte, EMPTY_ACOLYTE
+from Utilities.AssociationObject import Association, EMPTY_ASSC
+from Utilities.ItemObject import (Accessory, Weapon, Armor, EMPTY_WEAPON, 
+    EMPTY_ARMOR, EMPTY_ACCESSORY)
 
 
 class Belligerent:
@@ -21,11 +22,12 @@ class Belligerent:
     """
     def __init__(self, name : str, occ_type : str, attack : int, crit : int,
             hp : int, defense : int, disc_id : int = None, 
-            weapon : Weapon = Weapon(), helmet : Armor = Armor(),
-            bodypiece : Armor = Armor(), boots : Armor = Armor(),
-            accessory : Accessory = Accessory(),
-            acolyte1 : Acolyte = Acolyte(), acolyte2 : Acolyte = Acolyte(),
-            assc : Association = Association()):
+            weapon : Weapon = EMPTY_WEAPON, helmet : Armor = EMPTY_ARMOR,
+            bodypiece : Armor = EMPTY_ARMOR, boots : Armor = EMPTY_ARMOR,
+            accessory : Accessory = EMPTY_ACCESSORY,
+            acolyte1 : Acolyte = EMPTY_ACOLYTE, 
+            acolyte2 : Acolyte = EMPTY_ACOLYTE,
+            assc : Association = EMPTY_ASSC):
         """
         Parameters
         ----------
@@ -39,6 +39,9 @@ class Weapon:
     crit : int
         The crit probability of the weapon
     """
+    __slots__ = ('is_empty', 'weapon_id', 'owner_id', 'name', 'type', 'rarity',
+        'attack', 'crit')
+
     def __init__(self, record : asyncpg.Record = None):
         """
         Parameters
@@ -138,6 +141,9 @@ class Armor:
     defense : int
         The damage reduction percentage of this armor piece
     """
+    __slots__ = ('is_empty', 'id', 'type', 'slot', 'owner_id', 'name', 
+        'defense')
+
     def __init__(self, record : asyncpg.Record = None):
         """
         Parameters
@@ -191,6 +197,9 @@ class Accessory:
     prefix : str
         The accessory's prefix, determining bonus
     """
+    __slots__ = ('is_empty', 'id', 'type', 'name', 'owner_id', 'prefix',
+        'bonus')
+
     def __init__(self, record : asyncpg.Record = None):
         if record is not None:
             self.is_empty = False
@@ -256,6 +265,12 @@ class Accessory:
         return bonus[self.prefix]
 
 
+# Shared empty objects for unequipped slots. Do not modify these.
+EMPTY_WEAPON = Weapon()
+EMPTY_ARMOR = Armor()
+EMPTY_ACCESSORY = Accessory()
+
+
 async def get_weapon_by_id(conn : asyncpg.Connection, item_id : int) -> Weapon:
     """Return a weapon object of the item with the given ID."""
     psql = """
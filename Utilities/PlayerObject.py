@@ -1,13 +1,67 @@
 import discord
 
 import asyncpg
+import collections
 import time
 
 from Utilities import Checks, ItemObject, Vars, AcolyteObject, AssociationObject
-from Utilities.ItemObject import Weapon
+from Utilities.ItemObject import Weapon, Armor, Accessory
 from Utilities.AcolyteObject import Acolyte
 from Utilities.AssociationObject import Association
 
+# Players with up to _CUBIC_XP_LIMIT xp level along the first curve, 
+# everyone above it along the second
+_CUBIC_XP_LIMIT = 540500
+
+def _cubic_level_xp(level : int) -> int:
+    """Returns the xp needed to reach the given level on the first curve."""
+    return int(10 * level**3 + 500)
+
+def _quartic_level_xp(level : int) -> int:
+    """Returns the xp needed to reach the given level on the second curve."""
+    return int(1/5 * level**4 + 108500)
+
+# The columns of the resources table, and the query giving each to a player
+_RESOURCES = ("wheat", "oat", "wood", "reeds", "pine", "moss", "iron", "cacao",
+    "fur", "bone", "silver")
+_RESOURCE_SQL = {
+    resource : (f"UPDATE resources SET {resource} = {resource} + $1 "
+                f"WHERE user_id = $2;")
+    for resource in _RESOURCES}
+
+# Fight results logged since the last flush_fight_logs, keyed by Discord ID.
+# Values are [boss wins, boss fights, pvp wins, pvp fights]
+_pending_fights = collections.defaultdict(lambda: [0, 0, 0, 0])
+
+# Recent officeholder lookups, keyed by office: (time fetched, record).
+# Offices only change weekly, so a record is trusted for _OFFICEHOLDER_TTL
+# seconds or until clear_officeholder_cache is called.
+_OFFICEHOLDER_TTL = 30
+_officeholder_cache = {}
+
+
+class Backpack:
+    """The resources a player is carrying. Each attribute is the amount of
+    the resource with that name.
+
+    Attributes
+    ----------
+    wheat, oat, wood, reeds, pine, moss, iron, cacao, fur, bone, silver : int
+    """
+    __slots__ = _RESOURCES
+
+    def __init__(self, record : asyncpg.Record = None):
+        """
+        Parameters
+        ----------
+        Optional[record] : asyncpg.Record
+            A record containing a column for each resource
+            Pass nothing to create an empty backpack
+        """
+        for resource in _RESOURCES:
+            setattr(self, resource, 
+                record[resource] if record is not None else 0)
+
 
 class Player:
     """The Ayesha character object
@@ -60,100 +114,100 @@ class Player:
         The destination of the player's adventure on the map
     gravitas : int
         The player's wealth in gravitas (alternate currency)
-    resources : dict
-        A dictionary containing the player's resources
+    resources : Backpack
+        The resources the player is carrying
     daily_streak : int
         The amount of days in a row the player has used the `daily` command
     """
+    __slots__ = ('disc_id', 'unique_id', 'char_name', 'xp', 'level',
+        'equipped_item', 'helmet', 'bodypiece', 'boots', 'accessory',
+        'acolyte1', 'acolyte2', 'assc', 'guild_rank', 'gold', 'occupation',
+        'origin', 'location', 'pvp_wins', 'pvp_fights', 'boss_wins',
+        'boss_fights', 'rubidics', 'pity_counter', 'adventure', 'destination',
+        'gravitas', 'resources', 'pve_limit', '_stats_cache', '_weapon_bonus',
+        '_atk_bonus', '_crit_bonus', '_hp_bonus')
+
     def __init__(self, record : asyncpg.Record):
         """
         Parameters
         ----------
         record : asyncpg.Record
-            A record containing information from the players table
+            A record containing information from the players table, joined
+            with the player's equipment (see get_player_by_id)
         """
-        self.disc_id = record['user_id']
-        self.unique_id = record['num']
-        self.char_name = record['user_name']
-        self.xp = record['xp']
+        (self.unique_id, self.disc_id, self.char_name, self.xp, 
+         self.guild_rank, self.gold, self.occupation, self.origin, 
+         self.location, self.pvp_wins, self.pvp_fights, self.boss_wins, 
+         self.boss_fights, self.rubidics, self.pity_counter, self.adventure,
+         self.destination, self.gravitas, 
+         self.pve_limit) = record[:_PLAYER_COLUMN_COUNT]
         self.level = self.get_level()
-        self.equipped_item = record['equipped_item']
-        self.helmet = record['helmet']
-        self.bodypiece = record['bodypiece']
-        self.boots = record['boots']
-        self.accessory = record['accessory']
-        self.acolyte1 = record['acolyte1']
-        self.acolyte2 = record['acolyte2']
-        self.assc = record['assc']
-        self.guild_rank = record['guild_rank']
-        self.gold = record['gold']
-        self.occupation = record['occupation']
-        self.origin = record['origin']
-        self.location = record['loc']
-        self.pvp_wins = record['pvpwins']
-        self.pvp_fights = record['pvpfights']
-        self.boss_wins = record['bosswins']
-        self.boss_fights = record['bossfights']
-        self.rubidics = record['rubidics']
-        self.pity_counter = record['pitycounter']
-        self.adventure = record['adventure']
-        self.destination = record['destination']
-        self.gravitas = record['gravitas']
-        self.resources = None
-        self.pve_limit = record['pve_limit']
-
-    async def _load_equips(self, conn : asyncpg.Connection):
-        """Converts object variables from their IDs into the proper objects.
-        Run this upon instantiation or else >:(
+        self._load_equips(record)
+        self._load_bonuses()
+        self._stats_cache = {}
+
+    def _load_equips(self, record : asyncpg.Record):
+        """Builds the player's equipment objects and backpack from the joined
+        columns of the record passed to the constructor.
         """
-        self.equipped_item = await ItemObject.get_weapon_by_id(
-            conn, self.equipped_item)
-        self.helmet = await ItemObject.get_armor_by_id(conn, self.helmet)
-        self.bodypiece = await ItemObject.get_armor_by_id(conn, self.bodypiece)
-        self.boots = await ItemObject.get_armor_by_id(conn, self.boots)
-        self.accessory = await ItemObject.get_accessory_by_id(
-            conn, self.accessory)
-        self.acolyte1 = await AcolyteObject.get_acolyte_by_id(
-            conn, self.acolyte1)
-        self.acolyte2 = await AcolyteObject.get_acolyte_by_id(
-            conn, self.acolyte2)
-        self.assc = await AssociationObject.get_assc_by_id(conn, self.assc)
-        self.resources = dict(await self.get_backpack(conn))
+        self.equipped_item = _get_joined(record, "weapon_", 
+            Weapon, ItemObject.EMPTY_WEAPON)
+        self.helmet = _get_joined(record, "helmet_", 
+            Armor, ItemObject.EMPTY_ARMOR)
+        self.bodypiece = _get_joined(record, "bodypiece_", 
+            Armor, ItemObject.EMPTY_ARMOR)
+        self.boots = _get_joined(record, "boots_", 
+            Armor, ItemObject.EMPTY_ARMOR)
+        self.accessory = _get_joined(record, "accessory_", 
+            Accessory, ItemObject.EMPTY_ACCESSORY)
+        self.acolyte1 = _get_joined(record, "acolyte1_", 
+            Acolyte, AcolyteObject.EMPTY_ACOLYTE)
+        self.acolyte2 = _get_joined(record, "acolyte2_", 
+            Acolyte, AcolyteObject.EMPTY_ACOLYTE)
+        self.assc = _get_joined(record, "association_", 
+            Association, AssociationObject.EMPTY_ASSC)
+        self.resources = Backpack(record)
 
         # Radishes changes expedition time
         on_expedition = self.destination == "EXPEDITION"
-        radishes_equipped = "Radishes" in (a.acolyte_name 
-            for a in (self.acolyte1, self.acolyte2))
+        radishes_equipped = (self.acolyte1.acolyte_name == "Radishes" 
+            or self.acolyte2.acolyte_name == "Radishes")
         if on_expedition and radishes_equipped:
             time_bonus = int((time.time() - self.adventure) / 10)
             self.adventure -= time_bonus # Effectively increases length
 
+    def _load_bonuses(self):
+        """Stores the stat bonuses granted by the player's occupation and 
+        origin. Run this whenever either of them changes.
+        """
+        occupation = Vars.OCCUPATIONS[self.occupation]
+        origin = Vars.ORIGINS[self.origin]
+        self._weapon_bonus = occupation['weapon_bonus']
+        self._atk_bonus = occupation['atk_bonus'] + origin['atk_bonus']
+        self._crit_bonus = occupation['crit_bonus'] + origin['crit_bonus']
+        self._hp_bonus = occupation['hp_bonus'] + origin['hp_bonus']
+
     def get_level(self, get_next = False) -> int:
         """Returns the player's level.
         Pass get_next as true to also get the xp needed to level up.
         """
-        def f(x):
-            return int(10 * x**3 + 500)
-        
-        def g(x):
-            return int(1/5 * x**4 + 108500)
-
-        if self.xp <= 540500: # Simpler scaling for first 30 levels
-            level = 0
-            while (self.xp >= f(level)):
-                level += 1
+        # Invert the xp curve, then correct for floating point error
+        if self.xp <= _CUBIC_XP_LIMIT:
+            curve, lowest = _cubic_level_xp, 0
+            level = int((max(self.xp - 500, 0) / 10) ** (1/3))
         else:
-            level = 31
-            while (self.xp >= g(level)):
-                level += 1
-
-        level = level - 1 if level > 0 else 0
+            curve, lowest = _quartic_level_xp, 31
+            level = max(int(((self.xp - 108500) * 5) ** 0.25), lowest)
+        while level > lowest and curve(level) > self.xp:
+            level -= 1
+        while curve(level+1) <= self.xp:
+            level += 1
 
         if get_next:
             if level >= 30:
-                return level, g(level+1) - self.xp
+                return level, _quartic_level_xp(level+1) - self.xp
             else:
-                return level, f(level+1) - self.xp
+                return level, _cubic_level_xp(level+1) - self.xp
         else:
             return level
 
@@ -167,20 +221,27 @@ class Player:
         """
         old_level = self.level
         self.xp += xp
-        psql = """
-                UPDATE players
-                SET xp = xp + $1
-                WHERE user_id = $2;
-                """
-        await conn.execute(psql, xp, self.disc_id)
         self.level = self.get_level()
         if self.level > old_level: # Level up
             gold = self.level * 500
             rubidics = int(self.level / 30) + 1
+        else:
+            gold, rubidics = 0, 0
 
-            await self.give_gold(conn, gold)
-            await self.give_rubidics(conn, rubidics)
+        # Rewards are written alongside the xp to save a round trip
+        psql = """
+                UPDATE players
+                SET 
+                    xp = xp + $1,
+                    gold = gold + $2,
+                    rubidics = rubidics + $3
+                WHERE user_id = $4
+                RETURNING gold, rubidics;
+                """
+        self.gold, self.rubidics = await conn.fetchrow(
+            psql, xp, gold, rubidics, self.disc_id)
 
+        if self.level > old_level:
             embed = discord.Embed(
                 title = f"You have levelled up to level {self.level}!",
                 color = Vars.ABLUE)
@@ -198,6 +259,8 @@ class Player:
         if self.acolyte2.acolyte_name is not None:
             await self.acolyte2.check_xp_increase(conn, ctx, a_xp)
 
+        self._stats_cache.clear()
+
     async def set_char_name(self, conn : asyncpg.Connection, name : str):
         """Sets the player's character name. Limit 32 characters."""
         if len(name) > 32:
@@ -218,30 +281,42 @@ class Player:
         ID is in this player's inventory.
         """
         psql = """
-                SELECT item_id FROM items
-                WHERE user_id = $1 AND item_id = $2;
+                SELECT EXISTS (
+                    SELECT 1 FROM items
+                    WHERE user_id = $1 AND item_id = $2
+                );
                 """
-        val = await conn.fetchval(psql, self.disc_id, item_id)
-
-        return val is not None
+        return await conn.fetchval(psql, self.disc_id, item_id)
 
     async def equip_item(self, conn : asyncpg.Connection, item_id : int):
         """Equips an item on the player."""
-        if not await self.is_weapon_owner(conn, item_id):
-            raise Checks.NotWeaponOwner
-
-        self.equipped_item = await ItemObject.get_weapon_by_id(conn, item_id)
-
         psql = """
-                UPDATE players 
-                SET equipped_item = $1
-                WHERE user_id = $2;
+                WITH owned AS (
+                    SELECT 
+                        item_id, weapontype, user_id, attack, crit, 
+                        weapon_name, rarity
+                    FROM items
+                    WHERE user_id = $1 AND item_id = $2
+                ),
+                equipped AS (
+                    UPDATE players
+                    SET equipped_item = owned.item_id
+                    FROM owned
+                    WHERE players.user_id = $1
+                )
+                SELECT * FROM owned;
                 """
-        await conn.execute(psql, item_id, self.disc_id)
+        weapon_record = await conn.fetchrow(psql, self.disc_id, item_id)
+        if weapon_record is None:
+            raise Checks.NotWeaponOwner
+
+        self.equipped_item = Weapon(weapon_record)
+        self._stats_cache.clear()
 
     async def unequip_item(self, conn: asyncpg.Connection):
         """Unequips the current item from the player."""
-        self.equipped_item = Weapon() # Create an empty weapon
+        self.equipped_item = ItemObject.EMPTY_WEAPON
+        self._stats_cache.clear()
 
         psql = """
                 UPDATE players SET equipped_item = NULL WHERE user_id = $1;
@@ -254,45 +329,58 @@ class Player:
         ID is this player's inventory.
         """
         psql = """
-                SELECT armor_id FROM armor
-                WHERE user_id = $1 and armor_id = $2;
+                SELECT EXISTS (
+                    SELECT 1 FROM armor
+                    WHERE user_id = $1 AND armor_id = $2
+                );
                 """
-        return await conn.fetchval(psql, self.disc_id, armor_id) is not None
+        return await conn.fetchval(psql, self.disc_id, armor_id)
 
     async def equip_armor(self, conn : asyncpg.Connection, armor_id : int):
         """Equips armor to the player. Returns the Armor object."""
-        if not await self.is_armor_owner(conn, armor_id):
+        psql = """
+                WITH owned AS (
+                    SELECT armor_id, armor_type, armor_slot, user_id
+                    FROM armor
+                    WHERE user_id = $1 AND armor_id = $2
+                ),
+                equipped AS (
+                    UPDATE equips
+                    SET 
+                        helmet = CASE WHEN owned.armor_slot = 'Helmet'
+                            THEN owned.armor_id ELSE equips.helmet END,
+                        bodypiece = CASE WHEN owned.armor_slot = 'Bodypiece'
+                            THEN owned.armor_id ELSE equips.bodypiece END,
+                        boots = CASE WHEN owned.armor_slot = 'Boots'
+                            THEN owned.armor_id ELSE equips.boots END
+                    FROM owned
+                    WHERE equips.user_id = $1
+                )
+                SELECT * FROM owned;
+                """
+        armor_record = await conn.fetchrow(psql, self.disc_id, armor_id)
+        if armor_record is None:
             raise Checks.NotArmorOwner
 
-        armor = await ItemObject.get_armor_by_id(conn, armor_id)
+        armor = Armor(armor_record)
         if armor.slot == "Helmet":
             self.helmet = armor
-            psql = """
-                    UPDATE equips
-                    SET helmet = $1
-                    WHERE user_id = $2;
-                    """
         elif armor.slot == "Bodypiece":
             self.bodypiece = armor
-            psql = """
-                    UPDATE equips
-                    SET bodypiece = $1
-                    WHERE user_id = $2;
-                    """
         elif armor.slot == "Boots":
             self.boots = armor
-            psql = """
-                    UPDATE equips
-                    SET boots = $1
-                    WHERE user_id = $2;
-                    """
         else:
             raise Checks.InvalidArmorType
-        await conn.execute(psql, armor.id, self.disc_id)
+        self._stats_cache.clear()
         return armor
 
     async def unequip_armor(self, conn : asyncpg.Connection):
         """Unequips all armor the player is currently wearing."""
+        self.helmet = ItemObject.EMPTY_ARMOR
+        self.bodypiece = ItemObject.EMPTY_ARMOR
+        self.boots = ItemObject.EMPTY_ARMOR
+        self._stats_cache.clear()
+
         psql = """
                 UPDATE equips 
                 SET helmet = NULL, bodypiece = NULL, boots = NULL
@@ -306,27 +394,43 @@ class Player:
         ID is in this player's wardrobe.
         """
         psql = """
-                SELECT accessory_id FROM accessories
-                WHERE user_id = $1 AND accessory_id = $2;
+                SELECT EXISTS (
+                    SELECT 1 FROM accessories
+                    WHERE user_id = $1 AND accessory_id = $2
+                );
                 """
-        return await conn.fetchval(psql, self.disc_id, item_id) is not None
+        return await conn.fetchval(psql, self.disc_id, item_id)
 
     async def equip_accessory(self, conn : asyncpg.Connection, item_id : int):
         """Equips an accessory on the player."""
-        if not await self.is_accessory_owner(conn, item_id):
-            raise Checks.NotAccessoryOwner
-
-        self.accessory = await ItemObject.get_accessory_by_id(conn, item_id)
-
         psql = """
-                UPDATE equips 
-                SET accessory = $1
-                WHERE user_id = $2;
+                WITH owned AS (
+                    SELECT 
+                        accessory_id, accessory_type, accessory_name, user_id,
+                        prefix
+                    FROM accessories
+                    WHERE user_id = $1 AND accessory_id = $2
+                ),
+                equipped AS (
+                    UPDATE equips
+                    SET accessory = owned.accessory_id
+                    FROM owned
+                    WHERE equips.user_id = $1
+                )
+                SELECT * FROM owned;
                 """
-        await conn.execute(psql, item_id, self.disc_id)
+        accessory_record = await conn.fetchrow(psql, self.disc_id, item_id)
+        if accessory_record is None:
+            raise Checks.NotAccessoryOwner
+
+        self.accessory = Accessory(accessory_record)
+        self._stats_cache.clear()
 
     async def unequip_accessory(self, conn : asyncpg.Connection):
         """Unequips the accessory the player is currently wearing."""
+        self.accessory = ItemObject.EMPTY_ACCESSORY
+        self._stats_cache.clear()
+
         psql = """
                 UPDATE equips 
                 SET accessory = NULL
@@ -340,12 +444,12 @@ class Player:
         ID is in this player's tavern.
         """
         psql = """
-                SELECT acolyte_id FROM acolytes
-                WHERE user_id = $1 AND acolyte_id = $2;
+                SELECT EXISTS (
+                    SELECT 1 FROM acolytes
+                    WHERE user_id = $1 AND acolyte_id = $2
+                );
                 """
-        val = await conn.fetchval(self.disc_id, a_id)
-
-        return val is not None
+        return await conn.fetchval(psql, self.disc_id, a_id)
 
     async def equip_acolyte(self, conn : asyncpg.Connection, 
             acolyte_id : int, slot : int):
@@ -356,7 +460,7 @@ class Player:
             raise Checks.InvalidAcolyteEquip
             # Check this first because its inexpensive and won't waste time
 
-        if not self.is_acolyte_owner(conn, acolyte_id):
+        if not await self.is_acolyte_owner(conn, acolyte_id):
             raise Checks.NotAcolyteOwner
 
         a = acolyte_id == self.acolyte1.acolyte_id
@@ -365,20 +469,23 @@ class Player:
             raise Checks.InvalidAcolyteEquip
 
         if slot == 1:
-            self.acolyte1 = AcolyteObject.get_acolyte_by_id(conn, acolyte_id)
+            self.acolyte1 = await AcolyteObject.get_acolyte_by_id(
+                conn, acolyte_id)
             psql = """
                     UPDATE players
                     SET acolyte1 = $1
                     WHERE user_id = $2;
                     """
         elif slot == 2:
-            self.acolyte2 = AcolyteObject.get_acolyte_by_id(conn, acolyte_id)
+            self.acolyte2 = await AcolyteObject.get_acolyte_by_id(
+                conn, acolyte_id)
             psql = """
                     UPDATE players
                     SET acolyte2 = $1
                     WHERE user_id = $2;
                     """
         
+        self._stats_cache.clear()
         await conn.execute(psql, acolyte_id, self.disc_id)
 
     async def unequip_acolyte(self, conn : asyncpg.Connection, slot : int):
@@ -386,15 +493,16 @@ class Player:
         slot must be an integer 1 or 2.
         """
         if slot == 1:
-            self.acolyte1 = Acolyte()
+            self.acolyte1 = AcolyteObject.EMPTY_ACOLYTE
             psql = "UPDATE players SET acolyte1 = NULL WHERE user_id = $1;"
             await conn.execute(psql, self.disc_id)
         elif slot == 2:
-            self.acolyte2 = Acolyte()
+            self.acolyte2 = AcolyteObject.EMPTY_ACOLYTE
             psql = "UPDATE players SET acolyte2 = NULL WHERE user_id = $1;"
             await conn.execute(psql, self.disc_id)
         else:
             raise Checks.InvalidAcolyteEquip
+        self._stats_cache.clear()
 
     async def join_assc(self, conn : asyncpg.Connection, assc_id : int):
         """Makes the player join the association with the given ID"""
@@ -412,6 +520,7 @@ class Player:
         await conn.execute(psql, assc_id, self.disc_id)
 
         self.assc = assc
+        self._stats_cache.clear()
 
     async def set_association_rank(self, conn : asyncpg.Connection, rank : str):
         """Sets the player's association rank."""
@@ -430,106 +539,79 @@ class Player:
         if self.assc.is_empty:
             return
 
-        psql1 = """
-                UPDATE players
-                SET assc = NULL, guild_rank = NULL
-                WHERE user_id = $1;
-                """
-        psql2 = """
-                UPDATE brotherhood_champions
-                SET champ1 = NULL
-                WHERE champ1 = $1;
-                """
-        psql3 = """
-                UPDATE brotherhood_champions
-                SET champ2 = NULL
-                WHERE champ2 = $1;
-                """
-        psql4 = """
-                UPDATE brotherhood_champions
-                SET champ3 = NULL
-                WHERE champ3 = $1;
-                """
-        psql5 = """
-                WITH balance AS (
+        psql = """
+                WITH cleared AS (
+                    UPDATE brotherhood_champions
+                    SET
+                        champ1 = CASE WHEN champ1 = $1 THEN NULL ELSE champ1 END,
+                        champ2 = CASE WHEN champ2 = $1 THEN NULL ELSE champ2 END,
+                        champ3 = CASE WHEN champ3 = $1 THEN NULL ELSE champ3 END
+                    WHERE $1 IN (champ1, champ2, champ3)
+                ),
+                balance AS (
                     DELETE FROM guild_bank_account
                     WHERE user_id = $1
                     RETURNING account_funds
                 )
-                SELECT account_funds 
-                FROM balance;
-                """
-        psql6 = """
                 UPDATE players
-                SET gold = gold + $1
-                WHERE user_id = $2;
+                SET 
+                    assc = NULL, 
+                    guild_rank = NULL,
+                    gold = gold + COALESCE(
+                        (SELECT SUM(account_funds) FROM balance), 0)
+                WHERE user_id = $1
+                RETURNING gold;
                 """
-
-        await conn.execute(psql1, self.disc_id)
-        await conn.execute(psql2, self.disc_id)
-        await conn.execute(psql3, self.disc_id)
-        await conn.execute(psql4, self.disc_id)
-        in_bank = await conn.fetchval(psql5, self.disc_id)
-        if in_bank is not None:
-            await conn.execute(psql6, in_bank, self.disc_id)
-
-        self.assc = Association()
+        self.gold = await conn.fetchval(psql, self.disc_id)
+        self.assc = AssociationObject.EMPTY_ASSC
+        self._stats_cache.clear()
 
     async def give_gold(self, conn : asyncpg.Connection, gold : int):
         """Gives the player the passed amount of gold."""
-        self.gold += gold
-
         psql = """
                 UPDATE players
                 SET gold = gold + $1
-                WHERE user_id = $2;
+                WHERE user_id = $2
+                RETURNING gold;
                 """
-
-        await conn.execute(psql, gold, self.disc_id)
+        self.gold = await conn.fetchval(psql, gold, self.disc_id)
 
     async def give_rubidics(self, conn : asyncpg.Connection, rubidics : int):
         """Gives the player the passed amount of rubidics."""
-        self.rubidics += rubidics
-
         psql = """
                 UPDATE players
                 SET rubidics = rubidics + $1
-                WHERE user_id = $2;
+                WHERE user_id = $2
+                RETURNING rubidics;
                 """
-
-        await conn.execute(psql, rubidics, self.disc_id)
+        self.rubidics = await conn.fetchval(psql, rubidics, self.disc_id)
 
     async def give_gravitas(self, conn : asyncpg.Connection, gravitas : int):
-        """Gives the player the passed amount of gravitas."""
-        if gravitas < 0 and gravitas*-1 > self.gravitas:
-            gravitas = self.gravitas * -1
-
-        self.gravitas += gravitas
-
+        """Gives the player the passed amount of gravitas. 
+        Gravitas cannot go below 0.
+        """
         psql = """
                 UPDATE players
-                SET gravitas = gravitas + $1
-                WHERE user_id = $2;
+                SET gravitas = GREATEST(gravitas + $1, 0)
+                WHERE user_id = $2
+                RETURNING gravitas;
                 """
-        await conn.execute(psql, gravitas, self.disc_id)
+        self.gravitas = await conn.fetchval(psql, gravitas, self.disc_id)
 
     async def give_resource(self, conn : asyncpg.Connection, resource : str, 
             amount : int):
         """Give a resource to the player."""
-        try:
-            if amount < 0 and amount*-1 > self.resources[resource]:
-                raise Checks.NotEnoughResources(resource, 
-                    amount*-1 - self.resources[resource], 
-                    self.resources[resource])
-        except KeyError:
-            raise Checks.InvalidResource
-
-        psql = f"""
-                UPDATE resources
-                SET {resource} = {resource} + $1
-                WHERE user_id = $2;
-                """
-        await conn.execute(psql, amount, self.disc_id)
+        resource = resource.lower()
+        if resource not in _RESOURCE_SQL:
+            raise Checks.InvalidResource(resource)
+
+        current = getattr(self.resources, resource)
+        if amount < 0 and amount*-1 > current:
+            raise Checks.NotEnoughResources(resource, amount*-1 - current, 
+                current)
+
+        await conn.execute(_RESOURCE_SQL[resource], amount, self.disc_id)
+        setattr(self.resources, resource, current + amount)
 
     async def get_backpack(self, conn : asyncpg.Connection) -> asyncpg.Record:
         """Returns a dict containg the player's resource amounts. Keys are:
@@ -561,6 +643,8 @@ class Player:
             raise Checks.InvalidOccupation(occupation)
 
         self.occupation = occupation
+        self._load_bonuses()
+        self._stats_cache.clear()
         psql = """
                 UPDATE players
                 SET occupation = $1
@@ -574,6 +658,8 @@ class Player:
             raise Checks.InvalidOrigin
 
         self.origin = origin
+        self._load_bonuses()
+        self._stats_cache.clear()
         psql = """
                 UPDATE players
                 SET origin = $1
@@ -614,195 +700,364 @@ class Player:
 
     async def log_pve(self, conn : asyncpg.Connection, victory : bool):
         """Increments the player's boss_fights counter, and boss_wins
-        if applicable.
+        if applicable. The change is saved by the next flush_fight_logs.
         """
+        counts = _pending_fights[self.disc_id]
+        self.boss_fights += 1
+        counts[1] += 1
         if victory:
-            self.boss_fights += 1
             self.boss_wins += 1
-            psql = """
-                    UPDATE players
-                    SET 
-                        bosswins = bosswins + 1,
-                        bossfights = bossfights + 1
-                    WHERE user_id = $1;
-                    """
-        else:
-            self.boss_fights += 1
-            psql = """
-                    UPDATE players
-                    SET bossfights = bossfights + 1
-                    WHERE user_id = $1;
-                    """
-        await conn.execute(psql, self.disc_id)
+            counts[0] += 1
 
     async def log_pvp(self, conn : asyncpg.Connection, victory : bool):
         """Increments the player's pvp_fights counter, and pvp_wins
-        if applicable.
+        if applicable. The change is saved by the next flush_fight_logs.
         """
+        counts = _pending_fights[self.disc_id]
+        self.pvp_fights += 1
+        counts[3] += 1
         if victory:
-            self.pvp_fights += 1
             self.pvp_wins += 1
-            psql = """
-                    UPDATE players
-                    SET 
-                        pvpwins = pvpwins + 1,
-                        pvpfights = pvpfights + 1
-                    WHERE user_id = $1;
-                    """
-        else:
-            self.pvp_fights += 1
-            psql = """
-                    UPDATE players
-                    SET pvpfights = pvpfights + 1
-                    WHERE user_id = $1;
-                    """
-        await conn.execute(psql, self.disc_id)
+            counts[2] += 1
 
     async def increment_pve_limit(self, conn : asyncpg.Connection):
         """Increase the player's PVE limit by 1"""
-        self.pve_limit += 1
         psql = """
                 UPDATE players
                 SET pve_limit = pve_limit + 1
-                WHERE user_id = $1;
+                WHERE user_id = $1
+                RETURNING pve_limit;
                 """
-        await conn.execute(psql, self.disc_id)
+        self.pve_limit = await conn.fetchval(psql, self.disc_id)
 
     def get_attack(self) -> int:
         """Returns the player's attack stat, calculated from all other sources.
         The value returned by this method is 'the final say' on the stat.
         """
+        if 'attack' in self._stats_cache:
+            return self._stats_cache['attack']
+
         attack = 10 + int(self.level / 2)
         attack += self.equipped_item.attack
         attack += self.acolyte1.get_attack()
         attack += self.acolyte2.get_attack()
-        valid_weapons = Vars.OCCUPATIONS[self.occupation]['weapon_bonus']
-        if self.equipped_item.type in valid_weapons:
+        if self.equipped_item.type in self._weapon_bonus:
             attack += 20
-        attack += Vars.ORIGINS[self.origin]['atk_bonus']
+        attack += self._atk_bonus # Occupation and origin
         if self.assc.type == "Brotherhood":
             lvl = self.assc.get_level()
             attack += int(lvl * (lvl + 1) / 4)
-        attack += Vars.OCCUPATIONS[self.occupation]['atk_bonus']
         attack = int(attack * 1.1) if self.occupation == "Soldier" else attack
         if self.accessory.prefix == "Demonic":
             attack += Vars.ACCESSORY_BONUS["Demonic"][self.accessory.type]
         # TODO implement comptroller bonus
 
+        self._stats_cache['attack'] = attack
         return attack
 
     def get_crit(self) -> int:
         """Returns the player's crit stat, calculated from all other sources.
         The value returned by this method is 'the final say' on the stat.
         """
+        if 'crit' in self._stats_cache:
+            return self._stats_cache['crit']
+
         crit = 5
         crit += self.equipped_item.crit
         crit += self.acolyte1.get_crit()
         crit += self.acolyte2.get_crit()
-        crit += Vars.ORIGINS[self.origin]['crit_bonus']
+        crit += self._crit_bonus # Occupation and origin
         if self.assc.type == "Brotherhood":
             crit += self.assc.get_level()
-        crit += Vars.OCCUPATIONS[self.occupation]['crit_bonus']
         if self.accessory.prefix == "Flexible":
             crit += Vars.ACCESSORY_BONUS["Flexible"][self.accessory.type]
         # TODO implement comptroller bonus
 
+        self._stats_cache['crit'] = crit
         return crit
 
     def get_hp(self) -> int:
         """Returns the player's HP stat, calculated from all other sources.
         The value returned by this method is 'the final say' on the stat.
         """
+        if 'hp' in self._stats_cache:
+            return self._stats_cache['hp']
+
         hp = 500 + self.level * 3
         hp += self.acolyte1.get_hp()
         hp += self.acolyte2.get_hp()
-        hp += Vars.ORIGINS[self.origin]['hp_bonus']
-        hp += Vars.OCCUPATIONS[self.occupation]['hp_bonus']
+        hp += self._hp_bonus # Occupation and origin
         if self.accessory.prefix == "Thick":
             hp += Vars.ACCESSORY_BONUS["Thick"][self.accessory.type]
         # TODO implement comptroller bonus
 
+        self._stats_cache['hp'] = hp
         return hp
 
     def get_defense(self) -> int:
         """Returns the player's DEF stat, calculated from all other sources.
         The value returned by this method is 'the final say` on the stat.
         """
+        if 'defense' in self._stats_cache:
+            return self._stats_cache['defense']
+
         base = self.helmet.defense + self.bodypiece.defense + self.boots.defense
-        if self.occupation == "Leatherworker":
-            if not self.helmet.is_empty:
-                base += 3
-            if not self.bodypiece.is_empty:
-                base += 3
-            if not self.boots.is_empty:
-                base += 3
+        if self.occupation == "Leatherworker": # +3 per armor piece worn
+            base += 3 * (3 - self.helmet.is_empty - self.bodypiece.is_empty 
+                - self.boots.is_empty)
         if self.accessory.prefix == "Strong":
             base += Vars.ACCESSORY_BONUS["Strong"][self.accessory.type]
+
+        self._stats_cache['defense'] = base
         return base
 
 
+# The columns of each object joined onto _PLAYER_SELECT, keyed by the prefix
+# of their aliases. The first column is the object's ID.
+_JOINED_COLUMNS = {
+    prefix : tuple((column, prefix + column) for column in columns)
+    for prefix, columns in (
+        ("weapon_", ("item_id", "weapontype", "user_id", "attack", "crit", 
+            "weapon_name", "rarity")),
+        ("helmet_", ("armor_id", "armor_type", "armor_slot", "user_id")),
+        ("bodypiece_", ("armor_id", "armor_type", "armor_slot", "user_id")),
+        ("boots_", ("armor_id", "armor_type", "armor_slot", "user_id")),
+        ("accessory_", ("accessory_id", "accessory_type", "accessory_name", 
+            "user_id", "prefix")),
+        ("acolyte1_", ("acolyte_id", "user_id", "acolyte_name", "xp", 
+            "duplicate")),
+        ("acolyte2_", ("acolyte_id", "user_id", "acolyte_name", "xp", 
+            "duplicate")),
+        ("association_", ("assc_id", "assc_name", "assc_type", "assc_xp", 
+            "leader_id", "assc_desc", "assc_icon", "join_status", "base", 
+            "base_set", "min_level")))}
+
+def _get_joined(record : asyncpg.Record, prefix : str, cls : type, empty):
+    """Builds an object of type cls from the columns of record aliased with 
+    prefix, or returns the shared empty object if the joined row does not 
+    exist.
+    """
+    columns = _JOINED_COLUMNS[prefix]
+    if record[columns[0][1]] is None:
+        return empty
+    return cls({column : record[alias] for column, alias in columns})
+
+# Selects a player's row joined with everything loaded by Player._load_equips.
+# Append a WHERE clause on the players table to use. Player.__init__ unpacks
+# the first _PLAYER_COLUMN_COUNT columns by position, so keep them in order.
+_PLAYER_COLUMN_COUNT = 19
+_PLAYER_SELECT = """
+    SELECT 
+        players.num,
+        players.user_id,
+        players.user_name,
+        players.xp,
+        players.guild_rank,
+        players.gold,
+        players.occupation,
+        players.origin,
+        players.loc,
+        players.pvpwins,
+        players.pvpfights,
+        players.bosswins,
+        players.bossfights,
+        players.rubidics,
+        players.pitycounter,
+        players.adventure,
+        players.destination,
+        players.gravitas,
+        players.pve_limit,
+        weapon.item_id AS weapon_item_id,
+        weapon.weapontype AS weapon_weapontype,
+        weapon.user_id AS weapon_user_id,
+        weapon.attack AS weapon_attack,
+        weapon.crit AS weapon_crit,
+        weapon.weapon_name AS weapon_weapon_name,
+        weapon.rarity AS weapon_rarity,
+        helmet.armor_id AS helmet_armor_id,
+        helmet.armor_type AS helmet_armor_type,
+        helmet.armor_slot AS helmet_armor_slot,
+        helmet.user_id AS helmet_user_id,
+        bodypiece.armor_id AS bodypiece_armor_id,
+        bodypiece.armor_type AS bodypiece_armor_type,
+        bodypiece.armor_slot AS bodypiece_armor_slot,
+        bodypiece.user_id AS bodypiece_user_id,
+        boots.armor_id AS boots_armor_id,
+        boots.armor_type AS boots_armor_type,
+        boots.armor_slot AS boots_armor_slot,
+        boots.user_id AS boots_user_id,
+        accessory.accessory_id AS accessory_accessory_id,
+        accessory.accessory_type AS accessory_accessory_type,
+        accessory.accessory_name AS accessory_accessory_name,
+        accessory.user_id AS accessory_user_id,
+        accessory.prefix AS accessory_prefix,
+        acolyte1.acolyte_id AS acolyte1_acolyte_id,
+        acolyte1.user_id AS acolyte1_user_id,
+        acolyte1.acolyte_name AS acolyte1_acolyte_name,
+        acolyte1.xp AS acolyte1_xp,
+        acolyte1.duplicate AS acolyte1_duplicate,
+        acolyte2.acolyte_id AS acolyte2_acolyte_id,
+        acolyte2.user_id AS acolyte2_user_id,
+        acolyte2.acolyte_name AS acolyte2_acolyte_name,
+        acolyte2.xp AS acolyte2_xp,
+        acolyte2.duplicate AS acolyte2_duplicate,
+        associations.assc_id AS association_assc_id,
+        associations.assc_name AS association_assc_name,
+        associations.assc_type AS association_assc_type,
+        associations.assc_xp AS association_assc_xp,
+        associations.leader_id AS association_leader_id,
+        associations.assc_desc AS association_assc_desc,
+        associations.assc_icon AS association_assc_icon,
+        associations.join_status AS association_join_status,
+        associations.base AS association_base,
+        associations.base_set AS association_base_set,
+        associations.min_level AS association_min_level,
+        resources.wheat,
+        resources.oat,
+        resources.wood,
+        resources.reeds,
+        resources.pine,
+        resources.moss,
+        resources.iron,
+        resources.cacao,
+        resources.fur,
+        resources.bone,
+        resources.silver
+    FROM players
+    INNER JOIN equips
+        ON players.user_id = equips.user_id
+    LEFT JOIN items AS weapon
+        ON players.equipped_item = weapon.item_id
+    LEFT JOIN armor AS helmet
+        ON equips.helmet = helmet.armor_id
+    LEFT JOIN armor AS bodypiece
+        ON equips.bodypiece = bodypiece.armor_id
+    LEFT JOIN armor AS boots
+        ON equips.boots = boots.armor_id
+    LEFT JOIN accessories AS accessory
+        ON equips.accessory = accessory.accessory_id
+    LEFT JOIN acolytes AS acolyte1
+        ON players.acolyte1 = acolyte1.acolyte_id
+    LEFT JOIN acolytes AS acolyte2
+        ON players.acolyte2 = acolyte2.acolyte_id
+    LEFT JOIN associations
+        ON players.assc = associations.assc_id
+    LEFT JOIN resources
+        ON players.user_id = resources.user_id
+"""
+
+async def _fetch_player(conn : asyncpg.Connection, where : str, *args):
+    """Returns the player matching the given WHERE clause on _PLAYER_SELECT, 
+    or None if there is none. Only pass literal SQL as where; put any values 
+    in args.
+    """
+    psql = f"{_PLAYER_SELECT}WHERE {where};"
+    player_record = await conn.fetchrow(psql, *args)
+    if player_record is None:
+        return None
+    return Player(player_record)
+
+async def _fetch_players(conn : asyncpg.Connection, where : str, 
+        *args) -> list:
+    """Returns a list of every player matching the given WHERE clause on
+    _PLAYER_SELECT. Only pass literal SQL as where; put any values in args.
+    """
+    psql = f"{_PLAYER_SELECT}WHERE {where};"
+    return [Player(record) for record in await conn.fetch(psql, *args)]
+
 async def get_player_by_id(conn : asyncpg.Connection, user_id : int) -> Player:
     """Return a player object of the player with the given Discord ID."""
+    player = await _fetch_player(conn, "players.user_id = $1", user_id)
+    if player is None:
+        raise Checks.PlayerHasNoChar
+    return player
+
+async def get_players_by_id(conn : asyncpg.Connection, 
+        user_ids : list) -> list:
+    """Returns a list of player objects of the players with the given 
+    Discord IDs. IDs without a character are left out.
+    """
+    return await _fetch_players(conn, "players.user_id = ANY($1)", user_ids)
+
+async def get_players_by_assc(conn : asyncpg.Connection, 
+        assc_id : int) -> list:
+    """Returns a list of player objects of every member of the association
+    with the given ID.
+    """
+    return await _fetch_players(conn, "players.assc = $1", assc_id)
+
+async def give_gold_to_players(conn : asyncpg.Connection, payouts : dict):
+    """Gives gold to many players at once.
+    payouts maps each player's Discord ID to the amount of gold they receive.
+    """
     psql = """
-            SELECT 
-                players.num,
-                players.user_id,
-                players.user_name,
-                players.xp,
-                players.equipped_item,
-                players.acolyte1,
-                players.acolyte2,
-                players.assc,
-                players.guild_rank,
-                players.gold,
-                players.occupation,
-                players.origin,
-                players.loc,
-                players.pvpwins,
-                players.pvpfights,
-                players.bosswins,
-                players.bossfights,
-                players.rubidics,
-                players.pitycounter,
-                players.adventure,
-                players.destination,
-                players.gravitas,
-                players.pve_limit,
-                equips.helmet,
-                equips.bodypiece,
-                equips.boots,
-                equips.accessory
-            FROM players
-            INNER JOIN equips
-                ON players.user_id = equips.user_id
-            WHERE players.user_id = $1;
+            UPDATE players
+            SET gold = gold + $1
+            WHERE user_id = $2;
             """
-    
-    player_record = await conn.fetchrow(psql, user_id)
+    await conn.executemany(
+        psql, [(gold, user_id) for user_id, gold in payouts.items()])
 
-    if player_record is None:
-        raise Checks.PlayerHasNoChar
+async def flush_fight_logs(conn : asyncpg.Connection):
+    """Writes the fight results buffered by Player.log_pve and Player.log_pvp
+    to the database.
+    """
+    if not _pending_fights:
+        return
 
-    player = Player(player_record)
-    await player._load_equips(conn)
+    batch = [(*counts, user_id) for user_id, counts in _pending_fights.items()]
+    _pending_fights.clear()
 
-    return player
+    psql = """
+            UPDATE players
+            SET 
+                bosswins = bosswins + $1,
+                bossfights = bossfights + $2,
+                pvpwins = pvpwins + $3,
+                pvpfights = pvpfights + $4
+            WHERE user_id = $5;
+            """
+    try:
+        await conn.executemany(psql, batch)
+    except BaseException:
+        # Put the results back so that they are retried on the next flush,
+        # including when the flush is cancelled at shutdown
+        for *counts, user_id in batch:
+            pending = _pending_fights[user_id]
+            for i, count in enumerate(counts):
+                pending[i] += count
+        raise
 
 async def create_character(conn : asyncpg.Connection, user_id : int, 
         name : str) -> Player:
     """Creates and returns a profile for the user with the given Discord ID."""
-    psql1 = "INSERT INTO players (user_id, user_name) VALUES ($1, $2);"
-    psql2 = "INSERT INTO resources (user_id) VALUES ($1);"
-    psql3 = "INSERT INTO strategy (user_id) VALUES ($1);"
-    psql4 = "INSERT INTO equips (user_id) VALUES ($1);"
-    await conn.execute(psql1, user_id, name)
-    await conn.execute(psql2, user_id)
-    await conn.execute(psql3, user_id)
-    await conn.execute(psql4, user_id)
-
-    await ItemObject.create_weapon(
-        conn, user_id, "Common", attack=20, crit=0, weapon_name="Wooden Spear", 
-        weapon_type="Spear")
+    # The player row and everything hanging off it, including the starter 
+    # weapon, are inserted in one round trip. Being a single statement, it 
+    # commits atomically without needing an explicit transaction.
+    psql = """
+            WITH player AS (
+                INSERT INTO players (user_id, user_name) 
+                VALUES ($1, $2)
+                RETURNING user_id
+            ),
+            resources AS (
+                INSERT INTO resources (user_id) 
+                SELECT user_id FROM player
+            ),
+            strategy AS (
+                INSERT INTO strategy (user_id) 
+                SELECT user_id FROM player
+            ),
+            equips AS (
+                INSERT INTO equips (user_id) 
+                SELECT user_id FROM player
+            )
+            INSERT INTO items 
+                (weapontype, user_id, attack, crit, weapon_name, rarity)
+            SELECT 'Spear', user_id, 20, 0, 'Wooden Spear', 'Common' 
+            FROM player;
+            """
+    await conn.execute(psql, user_id, name)
 
     return await get_player_by_id(conn, user_id)
 
@@ -811,15 +1066,10 @@ async def get_player_by_num(conn : asyncpg.Connection, num : int) -> Player:
     (unique, non-Discord ID). Raises Checks.NonexistentPlayer if there is no
     player with this num.
     """
-    psql = """
-            SELECT user_id
-            FROM players
-            WHERE num = $1;
-            """
-    user_id = await conn.fetchval(psql, num)
-    if user_id is None:
+    player = await _fetch_player(conn, "players.num = $1", num)
+    if player is None:
         raise Checks.NonexistentPlayer
-    return await get_player_by_id(conn, user_id)
+    return player
 
 async def get_player_count(conn : asyncpg.Connection):
     """Return an integer of the amount of players in the database."""
@@ -829,32 +1079,55 @@ async def get_player_count(conn : asyncpg.Connection):
             """
     return await conn.fetchval(psql)
 
-async def get_comptroller(conn : asyncpg.Connection):
-    """Returns a record containing the current comptrollers's ID and username.
+async def get_player_count_estimate(conn : asyncpg.Connection):
+    """Return the planner's estimate of the amount of players in the database.
+    This avoids scanning the whole table, so use it where an exact count 
+    isn't needed.
+    """
+    psql = """
+            SELECT reltuples::bigint
+            FROM pg_class
+            WHERE oid = 'players'::regclass;
+            """
+    estimate = await conn.fetchval(psql)
+    if estimate < 0: # Table hasn't been analyzed yet
+        return await get_player_count(conn)
+    return estimate
+
+async def get_officeholder(conn : asyncpg.Connection, office : str):
+    """Returns a record containing the ID and username of the current holder 
+    of the given office ('Mayor' or 'Comptroller').
     Keys: officeholder, user_name
     """
-    psql1 = """
+    cached = _officeholder_cache.get(office)
+    if cached is not None and time.monotonic() - cached[0] < _OFFICEHOLDER_TTL:
+        return cached[1]
+
+    psql = """
             SELECT officeholders.officeholder, players.user_name
             FROM officeholders
             INNER JOIN players
                 ON officeholders.officeholder = players.user_id
-            WHERE office = 'Comptroller'
+            WHERE office = $1
             ORDER BY id DESC
             LIMIT 1;
             """
-    return await conn.fetchrow(psql1)
+    record = await conn.fetchrow(psql, office)
+    _officeholder_cache[office] = (time.monotonic(), record)
+    return record
+
+def clear_officeholder_cache():
+    """Forgets the cached officeholders. Call this after electing new ones."""
+    _officeholder_cache.clear()
+
+async def get_comptroller(conn : asyncpg.Connection):
+    """Returns a record containing the current comptrollers's ID and username.
+    Keys: officeholder, user_name
+    """
+    return await get_officeholder(conn, "Comptroller")
 
 async def get_mayor(conn : asyncpg.Connection):
     """Returns a record containing the current mayor's ID and username.
     Keys: officeholder, user_name
     """
-    psql1 = """
-            SELECT officeholders.officeholder, players.user_name
-            FROM officeholders
-            INNER JOIN players
-                ON officeholders.officeholder = players.user_id
-            WHERE office = 'Mayor'
-            ORDER BY id DESC
-            LIMIT 1;
-            """
-    return await conn.fetchrow(psql1)
\ No newline at end of file
+    return await get_officeholder(conn, "Mayor")
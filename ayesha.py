@@ -1,12 +1,14 @@
 import discord
 from discord.ext import commands
 
+import asyncio
+import contextlib
 import logging
 import traceback
 
 import asyncpg
 
-from Utilities import config, Vars
+from Utilities import config, Vars, PlayerObject
 
 logger = logging.getLogger('discord')
 logger.setLevel(logging.INFO)
@@ -88,6 +90,21 @@ class Ayesha(commands.AutoShardedBot):
 
         print("Ayesha is online.")
 
+    async def close(self):
+        # Stop the periodic flush, letting a flush in progress finish so 
+        # that it doesn't race this one, then save any fight results still 
+        # waiting for the next flush
+        self.fight_log_stop.set()
+        # The task may already have been cancelled by run() on shutdown
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.fight_log_task
+
+        try:
+            async with self.db.acquire() as conn:
+                await PlayerObject.flush_fight_logs(conn)
+        finally:
+            await super().close()
+
     async def on_interaction(self, interaction):
         if interaction.user.id in self.trading_players:
             return await interaction.response.send_message(
@@ -102,10 +119,33 @@ bot = Ayesha()
 async def create_db_pool():
     bot.db = await asyncpg.create_pool(database = config.DATABASE['name'],
                                        user = config.DATABASE['user'],
-                                       password = config.DATABASE['password'])
+                                       password = config.DATABASE['password'],
+                                       min_size = 10,
+                                       max_size = 50,
+                                       max_inactive_connection_lifetime = 300,
+                                       statement_cache_size = 2048)
 
 bot.loop.run_until_complete(create_db_pool())
 
+# Write the fight results logged by PvE and PvP in batches until the bot
+# closes, which does the last flush itself
+async def flush_fight_logs():
+    while True:
+        try:
+            await asyncio.wait_for(bot.fight_log_stop.wait(), timeout=2)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            async with bot.db.acquire() as conn:
+                await PlayerObject.flush_fight_logs(conn)
+        except Exception:
+            traceback.print_exc()
+
+bot.fight_log_stop = asyncio.Event()
+bot.fight_log_task = bot.loop.create_task(flush_fight_logs())
+
 # Ping command
 @bot.slash_command(guild_ids=[762118688567984151])
 async def ping(ctx):
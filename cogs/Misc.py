@@ -194,7 +194,7 @@ class Misc(commands.Cog):
             author = await PlayerObject.get_player_by_id(conn, ctx.author.id)
             # Meta information
             servers = len(ctx.bot.guilds)
-            players = await PlayerObject.get_player_count(conn)
+            players = await PlayerObject.get_player_count_estimate(conn)
             econ_info = await Analytics.get_econ_info(conn)
             acolyte_info = await Analytics.get_acolyte_info(conn)
             combat_info = await Analytics.get_combat_info(conn)
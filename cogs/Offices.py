@@ -65,6 +65,7 @@ class Offices(commands.Cog):
                         """
                 new_mayor_id = await conn.fetchval(psql1)
                 new_comp_id = await conn.fetchval(psql2)
+                PlayerObject.clear_officeholder_cache()
                 new_mayor = await self.bot.fetch_user(new_mayor_id)
                 new_comp = await self.bot.fetch_user(new_comp_id)
 
@@ -204,7 +204,6 @@ class Profile(commands.Cog):
             # Load information
             profile = await PlayerObject.get_player_by_id(conn, player.id)
             level, dist = profile.get_level(get_next=True)
-            pack = await profile.get_backpack(conn)
             gold_rank = Analytics.stringify_rank(
                 await Analytics.get_gold_rank(conn, player.id))
             gravitas_rank = Analytics.stringify_rank(
@@ -302,7 +301,8 @@ class Profile(commands.Cog):
             )
             page3.set_thumbnail(url=player.avatar.url)
             for resource in Vars.MATERIALS:
-                page3.add_field(name=resource, value=pack[resource.lower()])
+                page3.add_field(name=resource, 
+                    value=getattr(profile.resources, resource.lower()))
 
             if profile.assc.is_empty:
                 embeds = [page1, page2, page3]
@@ -88,9 +88,9 @@ class Raid(commands.Cog):
                     "Message" : None
                 }
             
-                for p in self.raid_participants:
-                    temp = await PlayerObject.get_player_by_id(conn, p)
-                    await temp.give_gold(conn, self.raid_participants[p] * 3)
+                await PlayerObject.give_gold_to_players(conn, {
+                    p : damage * 3 
+                    for p, damage in self.raid_participants.items()})
 
                 self.raid_participants = {}
 
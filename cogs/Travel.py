@@ -169,7 +169,7 @@ class Travel(commands.Cog):
                         user_id=player.disc_id,
                         rarity="Common")
                 else:
-                    new_weapon = ItemObject.Weapon()
+                    new_weapon = ItemObject.EMPTY_WEAPON
 
                 # Give the rewards
                 message = (
@@ -520,9 +520,9 @@ class Travel(commands.Cog):
 
             if player.gold < purchase.paying_price:
                 raise Checks.NotEnoughGold(purchase.paying_price, player.gold)
-            if player.resources["iron"] < iron_cost:
+            if player.resources.iron < iron_cost:
                 raise Checks.NotEnoughResources(
-                    "iron", iron_cost, player.resources["iron"])
+                    "iron", iron_cost, player.resources.iron)
 
             # If all else clears, upgrade the item
             await weapon.set_attack(conn, weapon.attack + iter)